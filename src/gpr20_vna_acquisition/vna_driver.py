@@ -5,7 +5,11 @@ VXI-11 protocol. This allows to encapsulate the communication mechanisms
 for higher-level utilities.
 """
 
-from socket import error
+import re
+import socket
+import time
+import numpy
+from functools import lru_cache, wraps
 from vxi11 import Instrument
 from vxi11.vxi11 import Vxi11Exception
 
@@ -15,26 +19,217 @@ VNA_CAL_MID = 1
 VNA_CAL_HIGH = 2
 VNA_CAL_NO_DATA = 3
 
+# Match the manufacturer and model fields of the identification response
+_IDN_RE = re.compile(r'"?([^",]*)"?,"?([^",]*)"?')
+
+# Map the instrument calibration accuracy values to calibration status
+_CAL_MAP = {
+    4: VNA_CAL_LOW,
+    3: VNA_CAL_MID,
+    2: VNA_CAL_MID,
+    1: VNA_CAL_HIGH,
+    0: VNA_CAL_NO_DATA,
+}
+
+# Define the time (in seconds) a successful exchange keeps the VNA alive
+VNA_PROBE_TTL = 0.5
+
+# Define the VXI-11 I/O timeout (in seconds) for the VNA link
+VNA_IO_TIMEOUT = 2.0
+
+# Define the portmapper port and the timeout (in seconds) to reach it
+VNA_PORTMAP_PORT = 111
+VNA_REACH_TIMEOUT = 0.25
+
+# Define the consecutive communication failures that mark the VNA as lost
+VNA_MAX_FAILURES = 3
+
+# Define the data type of the binary trace values (REAL,32 normal order)
+VNA_DATA_DTYPE = numpy.dtype(">f4")
+
+# Define the data type of the binary frequency values (REAL,64 normal
+# order), since 32-bit floats cannot hold GHz frequencies with Hz resolution
+VNA_FREQ_DTYPE = numpy.dtype(">f8")
+
+# Define the encoded setup commands and probes (the data format setup is
+# followed by an error query, which answers '0' if the format was accepted)
+_CMD_DATA_FORMAT = (
+    b"*CLS;:FORM:DATA REAL,32;:FORM:BORD NORM;:SYST:ERR?"
+)
+_CMD_SWEEP_SETUP = (
+    b":SENS:FREQ:STAR %d;:SENS:FREQ:STOP %d;:SENS:SWE:POIN %d;*OPC?"
+)
+_CMD_OPC = b"*OPC?"
+
+# Define the encoded data queries for each trace number (1 to 4). Each
+# query sets its own data format: REAL,64 for frequencies, REAL,32 for traces
+_CMD_TRACE_DATA = {
+    n: (":FORM:DATA REAL,32;:CALC%d:DATA? SDAT" % n).encode()
+    for n in range(1, 5)
+}
+_CMD_FREQ_DATA = {
+    n: (":FORM:DATA REAL,64;:SENSE%d:FREQ:DATA?" % n).encode()
+    for n in range(1, 5)
+}
+_CMD_SWEEP_DATA = {
+    n: (
+        ":FORM:DATA REAL,64;:SENSE%d:FREQ:DATA?;"
+        ":FORM:DATA REAL,32;:CALC%d:DATA? SDAT" % (n, n)
+    ).encode()
+    for n in range(1, 5)
+}
+
+
+@lru_cache(maxsize=16)
+def _trace_setup_command(n_trace, s_param, t_format):
+    """Build the encoded trace setup command.
+
+    Args:
+        n_trace (int): trace number.
+        s_param (str): S-parameter for the trace.
+        t_format (str): trace output format.
+
+    Returns:
+        bytes: command that sets the trace S-parameter and format.
+    """
+    return (
+        ":SENS:TRACE%d:SPAR %s;:CALC%d:FORM %s"
+        % (n_trace, s_param, n_trace, t_format)
+    ).encode()
+
+
+def _vxi_safe(on_error):
+    """Decorate a driver method to handle VNA communication errors.
+
+    If the decorated method raises a VXI-11 or socket error, the given value
+    is returned instead. Consecutive errors are counted, and the driver is
+    marked as disconnected after 'VNA_MAX_FAILURES' errors in a row. The
+    count is only reset by a successful exchange with the instrument, so
+    calls answered from cache do not hide a lost device.
+
+    Args:
+        on_error (object): value returned when a communication error occurs.
+
+    Returns:
+        callable: decorator for 'VNADriver' methods.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # Execute the method and count the communication errors
+            try:
+                result = method(self, *args, **kwargs)
+            except (Vxi11Exception, OSError) as vxi_error:
+                self._failures += 1
+                if self._failures >= VNA_MAX_FAILURES:
+                    self._connected = False
+                return on_error
+            return result
+        return wrapper
+    return decorator
+
+
+def _close_instrument(instrument):
+    """Close the link of an instrument, ignoring errors of a lost link.
+
+    Args:
+        instrument (vxi11.Instrument): instrument whose link is closed.
+    """
+    try:
+        instrument.close()
+    except (Vxi11Exception, OSError) as vxi_error:
+        pass
+
+
+def _parse_block(raw, offset=0):
+    """Extract the payload of an IEEE 488.2 definite length block.
+
+    The block has the '#<n><length><payload>' form, where '<n>' is a single
+    digit with the number of digits of '<length>', and '<length>' is the
+    number of bytes in '<payload>'.
+
+    Args:
+        raw (bytes): raw response read from the instrument.
+        offset (int): position of the block in the response.
+
+    Returns:
+        bytes: payload of the block.
+        int: position right after the end of the block.
+
+    Raises:
+        Vxi11Exception: if the response has no complete definite length
+            block at the given position.
+    """
+    # Check the block header and read the number of digits of the length
+    header = raw[offset:offset + 2]
+    if (len(header) != 2 or header[:1] != b"#" or
+            not header[1:].isdigit() or header[1:] == b"0"):
+        raise Vxi11Exception("Malformed data block", "parse")
+    n_digits = int(header[1:])
+
+    # Read the payload length
+    start = offset + 2 + n_digits
+    length_field = raw[offset + 2:start]
+    if len(length_field) != n_digits or not length_field.isdigit():
+        raise Vxi11Exception("Malformed data block length", "parse")
+    length = int(length_field)
+
+    # Check that the whole payload was received
+    if len(raw) < start + length:
+        raise Vxi11Exception("Incomplete data block", "parse")
+
+    # Return the payload bytes and the block end
+    return raw[start:start + length], start + length
+
 
 class VNADriver(object):
     """Class to provide an interface to the VNA instrument of the GPR-20.
 
     Attributes:
-        instrument (vxi11.Instrument): stores the instrument instance.
-        vna_connected (bool): flag to tell if VNA is connected.
-        vna_ip (str): stores the VNA IP address.
+        inst (vxi11.Instrument): stores the instrument instance.
+        connected (bool): flag to tell if VNA is connected. Exposed as
+            'vna_connected'.
+        ip (str): stores the VNA IP address. Exposed as 'vna_ip'.
+        last_ok_ts (float): monotonic time of the last successful exchange
+            with the VNA.
+        sweep_key (tuple): start frequency, stop frequency and points number
+            of the last frequency sweep set. 'None' if not set.
+        freq_cache (dict): frequency vectors read for the current sweep,
+            indexed by trace number.
+        failures (int): number of consecutive communication errors.
     """
 
+    # Declare the instance attributes
+    __slots__ = (
+        "_inst",
+        "_connected",
+        "_ip",
+        "_last_ok_ts",
+        "_sweep_key",
+        "_freq_cache",
+        "_failures",
+    )
+
     def __init__(self):
         """Initialize the VNA interface class."""
         # Define the instrument instance attribute
-        self.__instrument = None
+        self._inst = None
 
         # Define the VNA connected flag attribute
-        self.__vna_connected = False
+        self._connected = False
 
         # Define the VNA IP attribute
-        self.__vna_ip = None
+        self._ip = None
+
+        # Define the last successful exchange timestamp attribute
+        self._last_ok_ts = 0.0
+
+        # Define the frequency sweep key and frequency vectors cache
+        self._sweep_key = None
+        self._freq_cache = {}
+
+        # Define the consecutive communication errors count
+        self._failures = 0
 
     def connect_to_vna(self, ip_addr):
         """Connect to the VNA with a given IP address.
@@ -45,6 +240,9 @@ class VNADriver(object):
         checks consists of comparing the received device information with the
         expected values for manufacturer and model. If VNA is connected, the
         corresponding flag will be set to 'True' and the IP address stored.
+        Before opening the VXI-11 link, the IP address format is validated
+        and the device portmapper is probed, so that bad or unreachable
+        addresses fail fast.
 
         Args:
             ip_addr (str): IP addres that the VNA will connect to.
@@ -53,45 +251,95 @@ class VNADriver(object):
             bool: 'True' if the VNA was connected properly. 'False' otherwise.
             str: message with the result of the connect procedure.
         """
+        # Check that the IP address is well formed
+        try:
+            socket.inet_aton(ip_addr)
+        except (OSError, TypeError, ValueError) as e:
+            return False, "Invalid VNA IP address!"
+
+        # Check that the device portmapper can be reached
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(VNA_REACH_TIMEOUT)
+        try:
+            reach_status = sock.connect_ex((ip_addr, VNA_PORTMAP_PORT))
+        finally:
+            sock.close()
+
+        # Return 'False' if the device is unreachable
+        if reach_status != 0:
+            return False, "VNA unreachable!"
+
+        # Define the new instrument and the connection error message
+        instrument = None
+        error_message = None
+
         # Execute inside try/catch block
         try:
             # Create the instrument instance for VNA
-            self.__instrument = Instrument(ip_addr)
+            instrument = Instrument(ip_addr)
+
+            # Set the I/O timeout and do not wait for device locks
+            instrument.timeout = VNA_IO_TIMEOUT
+            instrument.lock_timeout = 0
+
+            # Open the link once so it is reused by all requests
+            instrument.open()
 
             # Ask the VNA device for its identification
-            response = self.__instrument.ask("*IDN?")
+            response = instrument.ask("*IDN?")
 
-            # Remove the leading and trailing quotation marks
-            response = response.replace('"', '')
+            # Extract the manufacturer and model fields
+            match = _IDN_RE.match(response)
 
-            # Split the response on commas
-            response = response.split(',')
+            # Check that manufacturer is 'Anritsu' and model is 'MS2026C/2'
+            if (match is None or match.group(1) != "Anritsu" or
+                    match.group(2) != "MS2026C/2"):
+                error_message = "Different device manufacturer and/or model!"
 
-            # Assert that manufacturer is 'Anritsu'
-            assert response[0] == "Anritsu", "Device manufacturer is \
-                not Anritsu"
+            # Set the data output to binary 32-bit floats in normal order,
+            # clearing previous errors and checking that no error was queued
+            elif (instrument.ask_raw(_CMD_DATA_FORMAT).split(b",")[0].strip()
+                    not in (b"0", b"+0")):
+                error_message = "VNA data format setup error!"
+
+        # Store the error if VNA connection fails
+        except OSError as e:
+            error_message = "VNA connection error!"
 
-            # Assert that device model is 'MS2026C/2'
-            assert response[1] == "MS2026C/2", "Device model is not \
-                MS2026C/2"
+        # Store the error if VNA communication fails
+        except Vxi11Exception as vxi_error:
+            error_message = "VNA communication error!"
 
-        # Return False if assertions fails
-        except AssertionError as e:
+        # Release the rejected link, keeping the current device untouched
+        if error_message is not None:
+            if instrument is not None:
+                _close_instrument(instrument)
 
             # Return 'False' to indicate an error with the message
-            return False, "Different device manufacturer and/or model!"
+            return False, error_message
 
-        # Return False if VNA connection fails
-        except OSError as e:
+        # Release the link of the previously connected device
+        if self._inst is not None:
+            _close_instrument(self._inst)
 
-            # Return 'False' to indicate an error with the message
-            return False, "VNA connection error!"
+        # Store the instrument instance
+        self._inst = instrument
 
         # Set the connected flag
-        self.__vna_connected = True
+        self._connected = True
 
         # Store the used IP address
-        self.__vna_ip = ip_addr
+        self._ip = ip_addr
+
+        # Store the successful exchange timestamp
+        self._last_ok_ts = time.monotonic()
+
+        # Reset the sweep of the previously connected device
+        self._sweep_key = None
+        self._freq_cache = {}
+
+        # Reset the communication errors count
+        self._failures = 0
 
         # Return 'True' if no error is raised
         return True, "Connected to VNA device"
@@ -100,56 +348,68 @@ class VNADriver(object):
         """Disconnect the VNA instrument.
 
         This method releases the connection to the VNA instrument and resets
-        the flags. The instrument attribute is set to 'None'. If the VNA
-        device is connected, the connection is closed before destroying the
-        communication.
+        the flags. It is the only place where the link is closed, since
+        communication errors are reported without tearing the link down. The
+        instrument attribute is set to 'None'. If an instrument exists, its
+        link is closed before destroying the communication, even when the
+        device was marked as disconnected after repeated errors.
 
         Returns:
             bool: indicating that the VNA device has been disconnected.
         """
-        # Checks if VNA is connected before disconnecting
-        if self.__vna_connected:
+        # Checks if an instrument exists before disconnecting
+        if self._inst is not None:
 
             # Close connection to VNA
-            self.__instrument.close()
+            _close_instrument(self._inst)
 
         # Reset connection flag
-        self.__vna_connected = False
+        self._connected = False
 
         # Reset IP attribute
-        self.__vna_ip = None
+        self._ip = None
+
+        # Reset the successful exchange timestamp
+        self._last_ok_ts = 0.0
+
+        # Reset the sweep key and frequency vectors cache
+        self._sweep_key = None
+        self._freq_cache = {}
 
         # Destroy instrument attribute
-        self.__instrument = None
+        self._inst = None
 
         # Return 'True' to indicate that VNA was disconnected
         return True
 
+    @_vxi_safe(False)
     def test_connection(self):
         """Test if VNA is connected and responding.
 
-        This mehtod tests the connection to the VNA device. The identification
-        query is sent to the device. If a timeout error is raised, the method
-        returns to indicate that the VNA is disconnected or unreachable.
+        This mehtod tests the connection to the VNA device. If the device
+        answered any request within the last 'VNA_PROBE_TTL' seconds, it is
+        considered alive without querying it again. Otherwise, the operation
+        complete query is sent to the device. If a timeout error is raised,
+        the method returns to indicate that the VNA is disconnected or
+        unreachable.
 
         Returns:
             bool: 'True' if no timeout is reached. 'False' otherwise.
         """
-        # Try to ask instrument identification
-        try:
-
-            # Asks the instrument its identification
-            self.__instrument.ask("*IDN?")
-
-            # Return 'True' if the response is retrieved.
+        # Skip the probe if the VNA answered recently
+        if time.monotonic() - self._last_ok_ts < VNA_PROBE_TTL:
             return True
 
-        # If exception is raised, flags are reset
-        except (Vxi11Exception, error) as vxi_error:
+        # Asks the instrument its operation complete status
+        self._inst.ask_raw(_CMD_OPC)
 
-            # Return 'False' to indicate that the device cannot be reached
-            return False
+        # Record the successful exchange
+        self._exchange_ok()
+
+        # Return 'True' if the response is retrieved.
+        return True
 
+    @_vxi_safe(VNA_CAL_NO_DATA)
     def check_calibration_status(self):
         """Check VNA instrument calibration status.
 
@@ -164,46 +424,25 @@ class VNADriver(object):
             int: calibration status. Values are defined as constant in
                 this module.
         """
-        # Ask instrument's calibration status in try/except block
-        try:
-
-            # Asks instument about its calibration status
-            status = int(self.__instrument.ask(
-                ":SENS:CORR:COLL:STAT:ACC?"
-            ))
-
-            # Returns low calibration status
-            if status == 4:
-                return VNA_CAL_LOW
+        # Asks instument about its calibration status
+        status = int(self._inst.ask(":SENS:CORR:COLL:STAT:ACC?"))
 
-            # Returns mid calibration status
-            elif status == 3 or status == 2:
-                return VNA_CAL_MID
+        # Record the successful exchange
+        self._exchange_ok()
 
-            # Returns high calibration status
-            elif status == 1:
-                return VNA_CAL_HIGH
-
-            # Returns that no data is available
-            elif status == 0:
-                return VNA_CAL_NO_DATA
-
-            # Returns no data if not in previous cases
-            return VNA_CAL_NO_DATA
-
-        # Raise exception on instrument error
-        except Vxi11Exception as vxi_error:
-
-            # Return that no data is available on calibration status
-            return VNA_CAL_NO_DATA
+        # Returns the mapped status, or no data for unknown values
+        return _CAL_MAP.get(status, VNA_CAL_NO_DATA)
 
+    @_vxi_safe(False)
     def set_frequency_sweep(self, f_start, f_stop, n_points):
         """Set the frequency sweep values.
 
         This mehtod sets the frequency sweep parameters in the VNA device.
         The frequency sweep parameters are the start and stop frequencies,
         that limit the data acquisition bandwith, and the frequency points
-        that define how many samples will be acquired.
+        that define how many samples will be acquired. The parameters are
+        sent in a single message ended by an operation complete query, which
+        acts as the barrier confirming that the device applied them.
 
         Args:
             f_start (int): start frequency for sweep.
@@ -211,30 +450,32 @@ class VNADriver(object):
             n_points(int): number of used frequency points.
 
         Returns:
-            bool: 'True' if no error is raised when setting the data in the
-                instrument. 'False' otherwise.
+            bool: 'True' if the instrument completed the setup without
+                errors. 'False' otherwise.
         """
-        # Try to write the frequency parameters
-        try:
+        # Invalidate the frequency vectors, even if the setup fails
+        self._sweep_key = None
+        self._freq_cache = {}
 
-            # Write the start frequency
-            self.__instrument.write(":SENS:FREQ:STAR " + str(f_start))
+        # Write start, stop and points number and wait for completion
+        response = self._inst.ask_raw(
+            _CMD_SWEEP_SETUP % (f_start, f_stop, n_points)
+        )
 
-            # Write the stop frequency
-            self.__instrument.write(":SENS:FREQ:STOP " + str(f_stop))
+        # Record the successful exchange
+        self._exchange_ok()
 
-            # Write the frequency points number
-            self.__instrument.write(":SENS:SWE:POIN " + str(n_points))
-
-            # Return 'True' to indicate that no error has occured
-            return True
+        # Return 'False' if the operation was not completed
+        if response.strip() != b"1":
+            return False
 
-        # Hanlde if a communication error is raised
-        except Vxi11Exception as vxi_error:
+        # Store the sweep parameters
+        self._sweep_key = (f_start, f_stop, n_points)
 
-            # Return 'False' to indicate that an error has occured
-            return False
+        # Return 'True' to indicate that no error has occured
+        return True
 
+    @_vxi_safe(False)
     def set_trace(self, n_trace=1, s_param="S21", t_format="SMITh"):
         """Set the trace that will be used for acquiring traces.
 
@@ -254,90 +495,230 @@ class VNADriver(object):
         Returns:
             bool: 'True' if the procedure was successful. 'False' otherwise.
         """
-        # Try to write trace parameters into device
-        try:
-
-            # Set trace number and S parameter
-            self.__instrument.write(
-                ":SENS:TRACE" + str(n_trace) + ":SPAR " + s_param
-                )
-
-            # Set trace format
-            self.__instrument.write(
-                ":CALC" + str(n_trace) + ":FORM " + t_format
-            )
-
-            # Return 'True' if the procedure was executed without errors
-            return True
+        # Set trace S parameter and format in a single message
+        self._inst.write_raw(
+            _trace_setup_command(n_trace, s_param, t_format)
+        )
 
-        # Raises an exception if an error occurs
-        except Vxi11Exception as vxi_trace:
+        # Record the successful exchange
+        self._exchange_ok()
 
-            # Return 'False' if the procedure was not executed without errors
-            return False
+        # Return 'True' if the procedure was executed without errors
+        return True
 
+    @_vxi_safe(None)
     def get_trace(self, n_trace):
         """Get trace vector in real/imaginary format.
 
         Ask the VNA device for the trace data. The trace consists of both real
         and imaginary values in the configured frequency values. Frequency
         data can be obtained using the 'get_freq' method from this class.
+        The values are read directly from the received bytes, without
+        copying them.
 
         Args:
             n_trace (int): trace number.
 
         Returns:
-            str: string with the non-formated values of the trace. 'None' if
-                an error occurs.
+            numpy.ndarray: trace values as 32-bit floats, with real and
+                imaginary parts interleaved. 'None' if an error occurs.
         """
-        # Perform execution in a try/except block
-        try:
-
-            # Ask the device for current trace data
-            return self.__instrument.ask(
-                ":CALC" + str(n_trace) + ":DATA? SDAT"
-            )
+        # Ask the device for current trace data
+        raw = self._query_raw(_CMD_TRACE_DATA[n_trace])
 
-        # Handle a communication error
-        except Vxi11Exception as vxi_exception:
-
-            # Return None to tell that an error has occured.
-            return None
+        # Parse and return the trace data
+        return self._parse_trace(_parse_block(raw)[0])
 
+    @_vxi_safe(None)
     def get_freq(self, n_trace):
         """Get frequency vector from instrument.
 
         Ask the VNA device for the frequency data trace. This trace is
         generated when setting up the frequency parameters. It returns the
-        frequencies vector that is matched to trace data.
+        frequencies vector that is matched to trace data. Since the vector
+        only changes with the frequency sweep, it is read once per sweep and
+        then served from cache.
 
         Args:
             n_trace (int): trace number.
 
         Returns:
-            str: non-formatted string with the frequency values. 'None' if an
+            numpy.ndarray: frequency values as 64-bit floats. 'None' if an
                 error occurs.
         """
-        # Perform execution in a try/except block
-        try:
+        # Return the cached frequency vector if available
+        freq = self._freq_cache.get(n_trace)
+        if freq is not None:
+            return freq
+
+        # Ask the device for frequency data
+        raw = self._query_raw(_CMD_FREQ_DATA[n_trace])
+
+        # Parse the frequency data
+        freq = self._parse_freq(_parse_block(raw)[0])
+
+        # Cache the frequency data if the sweep is known
+        if self._sweep_key is not None:
+            self._freq_cache[n_trace] = freq
+
+        # Return the frequency data
+        return freq
+
+    @_vxi_safe(None)
+    def get_sweep(self, n_trace):
+        """Get both frequency and trace vectors from instrument.
+
+        Ask the VNA device for the frequency and trace data in a single
+        compound query, whose response holds both binary blocks separated by
+        a semicolon. If the frequency vector is already cached for the
+        current sweep, only the trace data is requested.
+
+        Args:
+            n_trace (int): trace number.
+
+        Returns:
+            tuple: frequency values as a 64-bit float array and trace values
+                as a 32-bit float array. 'None' if an error occurs.
+        """
+        # Only ask for the trace if the frequency vector is cached
+        freq = self._freq_cache.get(n_trace)
+        if freq is not None:
+            raw = self._query_raw(_CMD_TRACE_DATA[n_trace])
+            return freq, self._parse_trace(_parse_block(raw)[0])
+
+        # Ask the device for frequency and trace data
+        raw = self._query_raw(_CMD_SWEEP_DATA[n_trace])
+
+        # Parse the frequency block and the trace block after it
+        freq_payload, end = _parse_block(raw)
+        if raw[end:end + 1] != b";":
+            raise Vxi11Exception("Missing trace data block", "parse")
+        data_payload = _parse_block(raw, end + 1)[0]
+        freq = self._parse_freq(freq_payload)
+        data = self._parse_trace(data_payload)
+
+        # Cache the frequency data if the sweep is known
+        if self._sweep_key is not None:
+            self._freq_cache[n_trace] = freq
+
+        # Return the frequency and trace data
+        return freq, data
+
+    def get_cached_freq(self, n_trace):
+        """Get the cached frequency vector without querying the instrument.
+
+        This method does not communicate with the device, so it can be
+        called while another request is in progress.
+
+        Args:
+            n_trace (int): trace number.
+
+        Returns:
+            numpy.ndarray: frequency values as 64-bit floats. 'None' if the
+                vector has not been read for the current sweep.
+        """
+        return self._freq_cache.get(n_trace)
+
+    def _query_raw(self, command):
+        """Send an encoded query and read the raw response.
+
+        Args:
+            command (bytes): encoded query for the instrument.
+
+        Returns:
+            bytes: raw response of the instrument.
+        """
+        # Send the query and read its response
+        self._inst.write_raw(command)
+        raw = self._inst.read_raw()
+
+        # Record the successful exchange
+        self._exchange_ok()
+
+        # Return the raw response
+        return raw
+
+    def _exchange_ok(self):
+        """Record a successful exchange with the instrument.
+
+        Stores the exchange timestamp and resets the consecutive
+        communication errors count.
+        """
+        self._last_ok_ts = time.monotonic()
+        self._failures = 0
+
+    def _parse_trace(self, payload):
+        """Parse the trace values from a binary block payload.
+
+        The payload must hold two values (real and imaginary) per frequency
+        point.
+
+        Args:
+            payload (bytes): payload of the trace data block.
+
+        Returns:
+            numpy.ndarray: trace values as 32-bit floats.
+
+        Raises:
+            Vxi11Exception: if the payload size does not match a trace.
+        """
+        return self._parse_points(payload, VNA_DATA_DTYPE, 2)
+
+    def _parse_freq(self, payload):
+        """Parse the frequency values from a binary block payload.
+
+        The payload must hold one value per frequency point.
+
+        Args:
+            payload (bytes): payload of the frequency data block.
+
+        Returns:
+            numpy.ndarray: frequency values as 64-bit floats.
+
+        Raises:
+            Vxi11Exception: if the payload size does not match the sweep.
+        """
+        return self._parse_points(payload, VNA_FREQ_DTYPE, 1)
+
+    def _parse_points(self, payload, dtype, n_values):
+        """Parse per frequency point values from a binary block payload.
+
+        The payload must hold a non-empty set of whole points. Once the
+        frequency sweep is set, the number of points must also match the
+        configured one.
+
+        Args:
+            payload (bytes): payload of the data block.
+            dtype (numpy.dtype): data type of each value.
+            n_values (int): number of values per frequency point.
+
+        Returns:
+            numpy.ndarray: values read from the payload.
+
+        Raises:
+            Vxi11Exception: if the payload size does not match the sweep.
+        """
+        # Define the size in bytes of each frequency point
+        point_size = n_values * dtype.itemsize
 
-            # Ask the device for frequency data
-            return self.__instrument.ask(
-                ":SENSE" + str(n_trace) + ":FREQ:DATA?"
-            )
+        # Check that the payload holds a non-empty set of whole points
+        if not payload or len(payload) % point_size:
+            raise Vxi11Exception("Invalid data block size", "parse")
 
-        # Handle a communication error
-        except Vxi11Exception as vxi_exception:
+        # Check that the points number matches the configured sweep
+        if (self._sweep_key is not None and
+                len(payload) != point_size * self._sweep_key[2]):
+            raise Vxi11Exception("Unexpected data points number", "parse")
 
-            # Return None to tell that an error has occured.
-            return None
+        # Return the values without copying the payload
+        return numpy.frombuffer(payload, dtype=dtype)
 
     @property
     def vna_connected(self):
         """VNA connection status flag attribute."""
-        return self.__vna_connected
+        return self._connected
 
     @property
     def vna_ip(self):
         """VNA IP address attribute."""
-        return self.__vna_ip
+        return self._ip
@@ -1,33 +1,90 @@
 """ROS interface for the VNA acquisition utility."""
 
+import time
 import rospy
-from gpr20_vna_acquisition.vna_driver import VNADriver
+from concurrent.futures import ThreadPoolExecutor
+from gpr20_vna_acquisition.vna_driver import VNADriver, VNA_CAL_NO_DATA
 from gpr20_msgs.srv import VNAGetData, VNAGetDataResponse
 from gpr20_msgs.srv import VNAGetFreq, VNAGetFreqResponse
+from gpr20_msgs.srv import VNAGetSweep, VNAGetSweepResponse
 from gpr20_msgs.srv import VNASweepSetup, VNASweepSetupResponse
 from gpr20_msgs.srv import VNAConnection, VNAConnectionResponse
 from gpr20_msgs.srv import VNACalibrationStatus, VNACalibrationStatusResponse
 
+# Define the time (in seconds) a calibration status answer is reused
+CAL_STATUS_TTL = 0.25
+
 
 class VNANode(object):
     """VNA acquisition ROS interface for GPR-20 robot.
 
     This class provides the ROS interface from the software architecture to the
     Vector Network Analyzer (VNA) device used in the robot. The interface
-    consists of four services user for connecting and disconnecting the
-    device, setting up the frequency sweep parameters, getting the frequencies
-    vector and the trace itself.
+    consists of the services used for connecting and disconnecting the
+    device, checking its calibration status, setting up the frequency sweep
+    parameters, getting the frequencies vector and the trace itself, either
+    separately or together. All the requests to the device are executed
+    in order by a single worker thread that owns the driver, while answers
+    available from cache are returned without waiting for that thread.
+    Requests that need the device fail right away while the driver reports
+    it as disconnected, either because it was never connected or because
+    it was lost after repeated communication errors.
 
     Attributes:
         vna_driver (VNADriver): instance of the driver class for handling the
             VNA requests.
+        executor (ThreadPoolExecutor): single worker that executes the
+            driver requests in order.
+        cal_status (int): last calibration status read from the device.
+        cal_status_ts (float): monotonic time of the last calibration status.
+        connection_responses (dict): prebuilt connection responses by status.
+        sweep_responses (dict): prebuilt sweep setup responses by status.
+        data_fail_response (VNAGetDataResponse): prebuilt data failure.
+        freq_fail_response (VNAGetFreqResponse): prebuilt frequency failure.
+        sweep_fail_response (VNAGetSweepResponse): prebuilt sweep failure.
     """
 
+    # Declare the instance attributes (private names are mangled)
+    __slots__ = (
+        "__vna_driver",
+        "__executor",
+        "__cal_status",
+        "__cal_status_ts",
+        "__connection_responses",
+        "__sweep_responses",
+        "__data_fail_response",
+        "__freq_fail_response",
+        "__sweep_fail_response",
+    )
+
     def __init__(self):
         """Initialize the VNA ROS interface class."""
         # Initialize the ROS node
         rospy.init_node("vna_acquisition", anonymous=False)
 
+        # Creates an instance of vna node
+        self.__vna_driver = VNADriver()
+
+        # Define the single worker that executes the driver requests
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+
+        # Define the cached calibration status and its timestamp
+        self.__cal_status = None
+        self.__cal_status_ts = 0.0
+
+        # Define the constant service responses, which are never modified
+        self.__connection_responses = {
+            True: VNAConnectionResponse(True),
+            False: VNAConnectionResponse(False),
+        }
+        self.__sweep_responses = {
+            True: VNASweepSetupResponse(True),
+            False: VNASweepSetupResponse(False),
+        }
+        self.__data_fail_response = VNAGetDataResponse(False, [])
+        self.__freq_fail_response = VNAGetFreqResponse(False, [])
+        self.__sweep_fail_response = VNAGetSweepResponse(False, [], [])
+
         # Create the connection service for VNA device
         rospy.Service(
             "vna_connection",
@@ -63,12 +120,32 @@ class VNANode(object):
             self.__get_vna_data_handler
         )
 
-        # Creates an instance of vna node
-        self.__vna_driver = VNADriver()
+        # Create the service for acquiring frequency vector and data together
+        rospy.Service(
+            "vna_get_sweep",
+            VNAGetSweep,
+            self.__get_sweep_handler
+        )
 
         # Keeps node alive
         rospy.spin()
 
+        # Stop the driver worker once the node is shut down
+        self.__executor.shutdown()
+
+    def __call_driver(self, method, *args):
+        """Queue a driver request and wait for its result.
+
+        Args:
+            method (callable): driver method to be executed.
+            *args: arguments for the driver method.
+
+        Returns:
+            object: value returned by the driver method.
+        """
+        # Queue the request for the worker and wait for its result
+        return self.__executor.submit(method, *args).result()
+
     def __connection_handler(self, srv):
         """Handle the connection and disconnection for VNA device.
 
@@ -86,18 +163,27 @@ class VNANode(object):
         """
         # Connects to VNA if connection flag is set
         if srv.connection:
-            status = self.__vna_driver.connect_to_vna(srv.ip_addr)[0]
+            status = self.__call_driver(
+                self.__vna_driver.connect_to_vna,
+                srv.ip_addr
+            )[0]
 
         # Disconnects from VNA if connection flag is unset
         else:
-            status = self.__vna_driver.disconnect_from_vna()
+            status = self.__call_driver(self.__vna_driver.disconnect_from_vna)
+
+        # Invalidate the cached calibration status
+        self.__cal_status = None
 
         # Returns the empty response
-        return VNAConnectionResponse(status)
+        return self.__connection_responses[status]
 
     def __get_calibration_status_handler(self, srv):
         """Handle the calibration status check request for VNA device.
 
+        The calibration status is reused without querying the device if it
+        was read within the last 'CAL_STATUS_TTL' seconds.
+
         Args:
             srv (gpr20_msgs.srv.VNACalibrationStatus): empty service request
                 for checking the VNA device calibration status.
@@ -106,8 +192,23 @@ class VNANode(object):
             gpr20_msgs.srv.VNACalibrationStatusResponse: response with the
                 calibration status as an integer value.
         """
+        # Return no data if the VNA is not connected
+        if not self.__vna_driver.vna_connected:
+            return VNACalibrationStatusResponse(VNA_CAL_NO_DATA)
+
+        # Check if the cached calibration status is still valid
+        if (self.__cal_status is not None and
+                time.monotonic() - self.__cal_status_ts < CAL_STATUS_TTL):
+            return VNACalibrationStatusResponse(self.__cal_status)
+
         # Check the calibration status in the device
-        cal_status = self.__vna_driver.check_calibration_status()
+        cal_status = self.__call_driver(
+            self.__vna_driver.check_calibration_status
+        )
+
+        # Store the calibration status and its timestamp
+        self.__cal_status = cal_status
+        self.__cal_status_ts = time.monotonic()
 
         # Return the service response
         return VNACalibrationStatusResponse(cal_status)
@@ -123,30 +224,30 @@ class VNANode(object):
             gpr20_msgs.srv.VNASweepResponse: response with boolean flag
                 indicating if process was successful or not.
         """
-        # Checks that number of points is valid (0-4000)
-        if srv.freq_points < 0 or srv.freq_points > 4000:
-            return VNASweepSetupResponse(False)
+        # Checks that number of points (0-4000) and frequencies (0-stop) are
+        # valid before sending anything to the device
+        if not (0 <= srv.freq_points <= 4000 and
+                0 <= srv.freq_start <= srv.freq_stop):
+            return self.__sweep_responses[False]
 
-        # Checks that stop frequency is valid (>0)
-        if srv.freq_stop < 0:
-            return VNASweepSetupResponse(False)
-
-        # Checks that start frequency is valid (0-stop)
-        if srv.freq_start > srv.freq_stop or srv.freq_stop < 0:
-            return VNASweepSetupResponse(False)
+        # Return an error if the VNA is not connected
+        if not self.__vna_driver.vna_connected:
+            return self.__sweep_responses[False]
 
         # Calls the method in driver to setup pararmeters
-        status = self.__vna_driver.set_frequency_sweep(
+        status = self.__call_driver(
+            self.__vna_driver.set_frequency_sweep,
             srv.freq_start,
             srv.freq_stop,
             srv.freq_points
         )
 
-        # Set the trace with the default configuration
-        self.__vna_driver.set_trace()
+        # Set the trace with the default configuration if sweep was set
+        if status:
+            self.__call_driver(self.__vna_driver.set_trace)
 
         # Returns false to indicate that parameters were configured properly
-        return VNASweepSetupResponse(status)
+        return self.__sweep_responses[status]
 
     def __get_vna_data_handler(self, srv):
         """Handle a request for the trace data vector from VNA device.
@@ -161,8 +262,12 @@ class VNANode(object):
                 empty. The flag is set as True if procedure was successful.
                 False otherwise.
         """
+        # Return an error if the VNA is not connected
+        if not self.__vna_driver.vna_connected:
+            return self.__data_fail_response
+
         # Retrieve the trace data
-        data = self.__vna_driver.get_trace(1)
+        data = self.__call_driver(self.__vna_driver.get_trace, 1)
 
         # Check acquired data
         if data is not None:
@@ -174,7 +279,7 @@ class VNANode(object):
         else:
 
             # Return an empty value to indicate an error
-            return VNAGetDataResponse(False, "")
+            return self.__data_fail_response
 
     def __get_freq_data_handler(self, srv):
         """Handle a request for the frequency vector from VNA device.
@@ -187,20 +292,47 @@ class VNANode(object):
             gpr20_msgs.srv.VNAGetFreqResponse: response that includes the
                 requested frequency vector.
         """
-        # Get frequency data from VNA instrument
-        freq_data = self.__vna_driver.get_freq(1)
+        # Return an error if the VNA is not connected
+        if not self.__vna_driver.vna_connected:
+            return self.__freq_fail_response
 
-        # Define status based on response
-        status = True if freq_data is not None else False
+        # Get frequency data from cache, or from VNA instrument otherwise
+        freq_data = self.__vna_driver.get_cached_freq(1)
+        if freq_data is None:
+            freq_data = self.__call_driver(self.__vna_driver.get_freq, 1)
 
-        # Check if status is 'False'
-        if not status:
-
-            # Convert frequency data to empty string
-            freq_data = ""
+        # Return an empty value to indicate an error
+        if freq_data is None:
+            return self.__freq_fail_response
 
         # Returns frequency data
-        return VNAGetFreqResponse(status, freq_data)
+        return VNAGetFreqResponse(True, freq_data)
+
+    def __get_sweep_handler(self, srv):
+        """Handle a request for both frequency and trace data from VNA device.
+
+        Args:
+            srv (gpr20_msgs.srv.VNAGetSweep): service request. The request is
+                empty since no parameters are required to get the sweep.
+
+        Returns:
+            gpr20_msgs.srv.VNAGetSweepResponse: response that includes a flag,
+                the frequency vector and the trace data. Vectors are empty and
+                the flag is 'False' if an error occurs.
+        """
+        # Return an error if the VNA is not connected
+        if not self.__vna_driver.vna_connected:
+            return self.__sweep_fail_response
+
+        # Get frequency and trace data from VNA instrument
+        sweep = self.__call_driver(self.__vna_driver.get_sweep, 1)
+
+        # Return an empty value to indicate an error
+        if sweep is None:
+            return self.__sweep_fail_response
+
+        # Returns frequency and trace data
+        return VNAGetSweepResponse(True, sweep[0], sweep[1])
 
     def __del__(self):
         """Execute on instance deletion."""